@@ -0,0 +1,153 @@
+import subprocess
+import asyncio
+import socket
+import uuid
+import time
+import os
+
+# Observação: Este script compara quantas conexões de clientes lentos cada modo aguenta antes de parar de atender os outros usuários.
+#             - Modo WSGI: gunicorn com workers síncronos (serie:app).
+#             - Modo ASGI: uvicorn com o serie_asgi:app e o mesmo número de threads no pool.
+#             Para cada quantidade de clientes lentos (metade enviando uma foto byte a byte, metade baixando uma foto bem devagar),
+#             mandamos algumas requisições rápidas para a tela de login e medimos quantas são respondidas dentro do prazo.
+#
+# Para rodar (a partir da raiz do repositório, assim como o serie.py; precisa do gunicorn e do uvicorn instalados):
+#   python flask-jinja2-crud-master/bench_asgi.py
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+HOST = "127.0.0.1"
+PORTA = 8765
+WORKERS = 4
+CLIENTES_LENTOS = [0, 2, 4, 8, 16, 32, 64]
+SONDAS = 5
+PRAZO_SONDA = 2.0
+COOKIES = "login=ironman; senha=ferro"
+TAMANHO_FOTO_GRANDE = 16 * 1024 * 1024
+
+MODOS = {
+    "WSGI": ["gunicorn", "--pythonpath", PASTA, "-w", str(WORKERS), "-b", f"{HOST}:{PORTA}", "serie:app"],
+    "ASGI": ["uvicorn", "--app-dir", PASTA, "--host", HOST, "--port", str(PORTA), "--log-level", "warning", "serie_asgi:app"],
+}
+
+####################################
+#### Clientes lentos e rápidos. ####
+####################################
+
+# Envia um upload de foto, mas um byte a cada meio segundo, e nunca termina.
+async def upload_lento():
+    _, escrita = await asyncio.open_connection(HOST, PORTA)
+    try:
+        escrita.write((
+            "POST /feirante/novo HTTP/1.1\r\n"
+            f"Host: {HOST}\r\n"
+            f"Cookie: {COOKIES}\r\n"
+            "Content-Type: multipart/form-data; boundary=xyz\r\n"
+            f"Content-Length: {1024 * 1024}\r\n"
+            "\r\n"
+        ).encode("latin1"))
+        while True:
+            escrita.write(b"x")
+            await escrita.drain()
+            await asyncio.sleep(0.5)
+    finally:
+        escrita.close()
+
+# Pede uma foto grande e lê a resposta bem devagar, com um buffer de recebimento pequeno.
+async def download_lento(id_foto):
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    s.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(s, (HOST, PORTA))
+    leitura, escrita = await asyncio.open_connection(sock = s, limit = 4096)
+    try:
+        escrita.write((
+            f"GET /feirante/foto/{id_foto} HTTP/1.1\r\n"
+            f"Host: {HOST}\r\n"
+            f"Cookie: {COOKIES}\r\n"
+            "\r\n"
+        ).encode("latin1"))
+        await escrita.drain()
+        while await leitura.read(1024):
+            await asyncio.sleep(0.5)
+    finally:
+        escrita.close()
+
+# Faz uma requisição rápida e retorna quanto tempo ela levou, ou None se passou do prazo.
+async def sonda():
+    inicio = time.perf_counter()
+    try:
+        leitura, escrita = await asyncio.wait_for(asyncio.open_connection(HOST, PORTA), PRAZO_SONDA)
+        escrita.write((
+            "GET /login HTTP/1.1\r\n"
+            f"Host: {HOST}\r\n"
+            f"Cookie: {COOKIES}\r\n"
+            "Connection: close\r\n"
+            "\r\n"
+        ).encode("latin1"))
+        linha = await asyncio.wait_for(leitura.readline(), PRAZO_SONDA - (time.perf_counter() - inicio))
+        escrita.close()
+        if not linha.startswith(b"HTTP/1.1 200"): return None
+        return time.perf_counter() - inicio
+    except (asyncio.TimeoutError, OSError):
+        return None
+
+############################
+#### Rodada de medição. ####
+############################
+
+async def medir(quantidade, id_foto):
+    lentos = []
+    for i in range(quantidade):
+        lentos.append(asyncio.create_task(upload_lento() if i % 2 == 0 else download_lento(id_foto)))
+    await asyncio.sleep(1)
+    tempos = await asyncio.gather(*[sonda() for _ in range(SONDAS)])
+    for t in lentos: t.cancel()
+    await asyncio.gather(*lentos, return_exceptions = True)
+    ok = [t for t in tempos if t is not None]
+    return len(ok), (sorted(ok)[len(ok) // 2] if ok else None)
+
+async def esperar_servidor():
+    for _ in range(100):
+        if await sonda() is not None: return
+        await asyncio.sleep(0.1)
+    raise RuntimeError("O servidor não subiu.")
+
+def rodar_modo(comando, id_foto):
+    env = dict(os.environ, SERIE_ASGI_THREADS = str(WORKERS))
+    processo = subprocess.Popen(comando, env = env, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+    resultados = []
+    try:
+        asyncio.run(esperar_servidor())
+        for quantidade in CLIENTES_LENTOS:
+            resultados.append((quantidade, *asyncio.run(medir(quantidade, id_foto))))
+            # Dá tempo para os workers presos perceberem que os clientes lentos foram embora.
+            time.sleep(1)
+    finally:
+        processo.terminate()
+        processo.wait()
+    return resultados
+
+def main():
+    id_foto = f"bench-{uuid.uuid1()}.jpg"
+    caminho = os.path.join(PASTA, "feirantes_fotos", id_foto)
+    with open(caminho, "wb") as f:
+        f.write(os.urandom(TAMANHO_FOTO_GRANDE))
+    try:
+        todos = {nome: rodar_modo(comando, id_foto) for nome, comando in MODOS.items()}
+    finally:
+        os.remove(caminho)
+
+    print(f"Workers/threads: {WORKERS}. Sondas por rodada: {SONDAS}, prazo de {PRAZO_SONDA}s cada.")
+    print(f"{'lentos':>8} | " + " | ".join(f"{nome + ' ok':>8} {nome + ' mediana':>14}" for nome in todos))
+    for i, quantidade in enumerate(CLIENTES_LENTOS):
+        colunas = []
+        for nome in todos:
+            _, ok, mediana = todos[nome][i]
+            colunas.append(f"{f'{ok}/{SONDAS}':>8} {(f'{mediana * 1000:.1f} ms' if mediana is not None else '-'):>14}")
+        print(f"{quantidade:>8} | " + " | ".join(colunas))
+    for nome in todos:
+        capacidade = max([q for q, ok, _ in todos[nome] if ok == SONDAS], default = 0)
+        print(f"{nome}: atendeu todas as sondas com até {capacidade} clientes lentos conectados.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.wsgi import FileWrapper
+from serie import app as app_wsgi, db_inicializar
+import asyncio
+import tempfile
+import sys
+import os
+
+# Observação: Este arquivo é o ponto de entrada ASGI (por exemplo, para o uvicorn) das MESMAS rotas definidas em serie.py.
+#             Nada de rotas, regras de negócio ou DAO é reescrito aqui. Cada requisição continua sendo processada pelo objeto "app" do Flask.
+#             A diferença está só em quem espera pela rede:
+#             - No modo WSGI, um worker síncrono fica preso enquanto um cliente lento envia uma foto ou baixa uma imagem.
+#             - Aqui, o corpo da requisição é recebido e a resposta é enviada de forma assíncrona, e só o trabalho bloqueante
+#               (o Flask, o sqlite3 e a leitura/escrita das fotos) roda num pool limitado de threads.
+#
+# Para rodar (a partir da raiz do repositório, assim como o serie.py):
+#   uvicorn --app-dir flask-jinja2-crud-master serie_asgi:app
+# ou simplesmente:
+#   python flask-jinja2-crud-master/serie_asgi.py
+
+############################################
+#### Pool de threads para o bloqueante. ####
+############################################
+
+# Quantidade máxima de threads que executam código bloqueante ao mesmo tempo. Pode ser alterada pela variável de ambiente SERIE_ASGI_THREADS.
+QUANTIDADE_THREADS = int(os.environ.get("SERIE_ASGI_THREADS", "8"))
+
+# Tamanho dos pedaços em que as fotos são lidas do disco e enviadas ao cliente.
+TAMANHO_BLOCO = 64 * 1024
+
+# Uploads até este tamanho ficam na memória. Acima disso, vão para um arquivo temporário.
+MEMORIA_MAXIMA_UPLOAD = 1024 * 1024
+
+executor = ThreadPoolExecutor(max_workers = QUANTIDADE_THREADS, thread_name_prefix = "serie-asgi")
+
+# Executa uma função bloqueante no pool de threads, sem travar o event loop.
+async def em_thread(funcao, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, funcao, *args)
+
+# O send_from_directory do Flask lê as fotos através do "wsgi.file_wrapper". Usamos pedaços maiores do que o padrão (8 KB)
+# para que cada ida ao pool de threads leia uma parte razoável do arquivo.
+def embrulhar_arquivo(arquivo, tamanho = TAMANHO_BLOCO):
+    return FileWrapper(arquivo, max(tamanho, TAMANHO_BLOCO))
+
+#########################
+#### Aplicação ASGI. ####
+#########################
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await ciclo_de_vida(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    # Recebe o corpo (por exemplo, o upload de uma foto) sem ocupar nenhuma thread.
+    corpo = await receber_corpo(receive)
+    if corpo is None:
+        return
+
+    try:
+        await executar_requisicao(scope, corpo, send)
+    finally:
+        await em_thread(corpo.close)
+
+# Equivalente ao bloco de inicialização do serie.py.
+async def ciclo_de_vida(receive, send):
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "lifespan.startup":
+            await em_thread(db_inicializar)
+            await send({"type": "lifespan.startup.complete"})
+        elif mensagem["type"] == "lifespan.shutdown":
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+# Lê o corpo da requisição aos pedaços, conforme o cliente os envia. Retorna None se o cliente desistir no meio do caminho.
+async def receber_corpo(receive):
+    corpo = tempfile.SpooledTemporaryFile(max_size = MEMORIA_MAXIMA_UPLOAD)
+    while True:
+        mensagem = await receive()
+        if mensagem["type"] == "http.disconnect":
+            await em_thread(corpo.close)
+            return None
+        pedaco = mensagem.get("body", b"")
+        if pedaco:
+            await em_thread(corpo.write, pedaco)
+        if not mensagem.get("more_body", False):
+            break
+    await em_thread(corpo.seek, 0)
+    return corpo
+
+# Roda o app do Flask no pool de threads e envia a resposta de forma assíncrona, um pedaço de cada vez.
+# Entre um pedaço e outro, nenhuma thread fica esperando pelo cliente.
+async def executar_requisicao(scope, corpo, send):
+    environ = montar_environ(scope, corpo)
+    inicio = {}
+    escritos = []
+
+    def start_response(status, headers, exc_info = None):
+        inicio["status"] = status
+        inicio["headers"] = headers
+        return escritos.append
+
+    def iniciar():
+        resultado = app_wsgi(environ, start_response)
+        try:
+            iterador = iter(resultado)
+            return resultado, iterador, next(iterador, None)
+        except BaseException:
+            if hasattr(resultado, "close"): resultado.close()
+            raise
+
+    resultado, iterador, pedaco = await em_thread(iniciar)
+    try:
+        status = int(inicio["status"].split(" ", 1)[0])
+        headers = [(nome.lower().encode("latin1"), valor.encode("latin1")) for nome, valor in inicio["headers"]]
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        for escrito in escritos:
+            await send({"type": "http.response.body", "body": escrito, "more_body": True})
+        while pedaco is not None:
+            if pedaco:
+                await send({"type": "http.response.body", "body": pedaco, "more_body": True})
+            pedaco = await em_thread(next, iterador, None)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+    finally:
+        if hasattr(resultado, "close"):
+            await em_thread(resultado.close)
+
+# Converte o scope do ASGI no environ que o Flask espera receber de um servidor WSGI.
+def montar_environ(scope, corpo):
+    servidor = scope.get("server") or ("localhost", 80)
+    cliente = scope.get("client") or ("", 0)
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf8").decode("latin1"),
+        "PATH_INFO": path.encode("utf8").decode("latin1"),
+        "QUERY_STRING": scope["query_string"].decode("latin1"),
+        "SERVER_NAME": servidor[0],
+        "SERVER_PORT": str(servidor[1]),
+        "REMOTE_ADDR": cliente[0],
+        "REMOTE_PORT": str(cliente[1]),
+        "SERVER_PROTOCOL": f"HTTP/{scope['http_version']}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": corpo,
+        "wsgi.input_terminated": True,
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": False,
+        "wsgi.run_once": False,
+        "wsgi.file_wrapper": embrulhar_arquivo,
+    }
+
+    for nome, valor in scope["headers"]:
+        nome = nome.decode("latin1")
+        valor = valor.decode("latin1")
+        if nome == "content-type":
+            chave = "CONTENT_TYPE"
+        elif nome == "content-length":
+            chave = "CONTENT_LENGTH"
+        else:
+            chave = "HTTP_" + nome.upper().replace("-", "_")
+        if chave in environ:
+            separador = "; " if chave == "HTTP_COOKIE" else ","
+            environ[chave] = environ[chave] + separador + valor
+        else:
+            environ[chave] = valor
+    return environ
+
+########################
+#### Inicialização. ####
+########################
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app)